@@ -26,30 +26,17 @@ def _repSentBlocks(sentences: list[str], count: int) -> list[str]:
     """
     repLst = list[str]()
     cpySents = [sentence.strip() for sentence in sentences]
+    # Finding empty strings, the ends of sentence blocks, in one pass...
+    blankIdxs = [idx for idx, sentence in enumerate(cpySents) if not sentence]
+    blankIdxs.append(len(cpySents))
     startIdx = 0
-    while True:
-        # Finding the start of a new sentence block...
-        try:
-            if not cpySents[startIdx]:
-                startIdx += 1
-                continue
-        except IndexError:
-            # We cold not find the start of a new sentence block.
-            # Exiting the algorithm...
-            break
-        # Finding the end of this sentence block...
-        try:
-            nextIdx = cpySents.index('', startIdx + 1)
-        except ValueError:
-            # We could not find the next empty string.
-            # So, this is the last block...
-            nextIdx = len(cpySents)
-        # Repeating this sentence block...
-        for _ in range(count):
-            repLst.extend(cpySents[startIdx:nextIdx])
-        repLst.append('')
-        # Getting ready for the next iteration...
-        startIdx = nextIdx + 1
+    for endIdx in blankIdxs:
+        # Repeating this sentence block unless it has no sentences...
+        if startIdx < endIdx:
+            repLst += cpySents[startIdx:endIdx] * count
+            repLst.append('')
+        # Getting ready for the next block...
+        startIdx = endIdx + 1
     return repLst
 
 
@@ -70,8 +57,7 @@ def _repLines(lines: list[str], count: int) -> list[str]:
             # No more lines, exiting the algorithm...
             break
         # Repeating the current line...
-        for _ in range(count):
-            repLst.append(cpyLines[idx])
+        repLst += [cpyLines[idx]] * count
         repLst.append('')
         # Going to next iteration...
         idx += 1
@@ -139,8 +125,17 @@ def main():
     lines = list[str]()
     print('Enter sentences, press Ctrl+C on an empty line to signal the end:')
     try:
-        for line in sys.stdin:
-            lines.append(line.strip())
+        if sys.stdin.isatty():
+            for line in sys.stdin:
+                lines.append(line.strip())
+        else:
+            # Reading redirected input at once. Splitting on newlines only,
+            # as iterating stdin does, unlike `str.splitlines`...
+            lines = sys.stdin.read().split('\n')
+            if not lines[-1]:
+                # Dropping the empty piece after the final newline...
+                lines.pop()
+            lines = [line.strip() for line in lines]
     except KeyboardInterrupt:
         pass
     # Processing...
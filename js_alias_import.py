@@ -6,13 +6,16 @@
 
 import argparse
 import datetime
-from functools import partial
+from functools import lru_cache
+import mmap
 import os
-from pathlib import Path, PurePosixPath
+from pathlib import PurePosixPath
 import re
 from re import Match, Pattern
+import stat
 import sys
-from typing import Iterable, Mapping
+import tempfile
+from typing import Iterable, Iterator, Mapping
 
 
 class STRS:
@@ -38,9 +41,9 @@ class STRS:
 
 
 _IMPORT_FROM_ALIAS_PATT = r'''
-    \bimport\b  # Capturing `import` word as a whole not in cases like `important`
+    import(?<!\wimport)\b  # Capturing `import` word as a whole not in cases like `important`
     \s+
-    (?P<stuff>(?:(?!\s+from\b).)*?) # Capturing anything but not `from`
+    (?P<stuff>(?:(?!\sfrom\b)[^'"])*?) # Capturing anything but not `from` & quotes
     \s+from\b   # Capturing `from` word as a whole & its preceding whitespace
     \s+
     (['"])                     # Capturing the opening quote
@@ -48,12 +51,18 @@ _IMPORT_FROM_ALIAS_PATT = r'''
     (?P<relPath>(?:/[^'"]+)+?) # Capturing the relative path
     \2                         # Matching the closing quote
 '''
+"""The pattern of import-from statements of the aliases. It starts with
+the `import` literal, rather than a word boundary, so that the regex
+engine can search for the literal prefix instead of trying every
+position. It is compiled as a bytes pattern, so it matches ASCII
+whitespace & word characters only.
+"""
 
 def replaceMatch(
-        changes: list[str],
-        mp_alias_path: Mapping[str, str],
-        match: Match[str],
-        ) -> str:
+        changes: list[bytes],
+        mp_alias_path: Mapping[bytes, bytes],
+        match: Match[bytes],
+        ) -> bytes:
     # Reading parts of the import-from statement...
     stuff = match.group('stuff')
     alias = match.group('alias')
@@ -61,77 +70,225 @@ def replaceMatch(
     quote = match.group(2)
     # Checking if the alias is in the mapping...
     try:
-        pthAlias = PurePosixPath(mp_alias_path[alias])
+        aliasPath = mp_alias_path[alias]
     except KeyError:
         # Doing nothing bacause alias is not present in tha mapping...
         return match.group(0)
     else:
         changes.append(alias)
-    # Changing the alias & the relPath...
-    alias = str(pthAlias)
-    pthRelPath = PurePosixPath(relPath)
-    if pthRelPath.suffix.lower() not in _KNOWN_EXTS:
-        pthRelPath = pthRelPath.with_suffix('.js')
-    relPath = str(pthRelPath)
+    # Normalizing the relPath like `PurePosixPath`, only if it has empty
+    # or `.` segments...
+    if relPath.endswith(b'/') or b'//' in relPath or b'/.' in relPath:
+        relPath = _normPosixPath(relPath)
+    # Changing the suffix of the relPath, like `PurePosixPath.suffix` &
+    # `PurePosixPath.with_suffix` but with no object per match...
+    slashIdx = relPath.rfind(b'/')
+    dotIdx = relPath.rfind(b'.')
+    if not slashIdx + 1 < dotIdx < len(relPath) - 1:
+        relPath += b'.js'
+    elif relPath[dotIdx:].lower() not in _KNOWN_EXTS:
+        relPath = relPath[:dotIdx] + b'.js'
     # Returning the updated import-from statement...
-    return f'import {stuff} from {quote}{alias}{relPath}{quote}'
+    return b'import %s from %s%s%s%s' % (
+        stuff, quote, aliasPath, relPath, quote)
 
 
-_KNOWN_EXTS = ['.json', '.js']
+_KNOWN_EXTS = frozenset({b'.json', b'.js'})
 """Known extensions that should not be changed."""
 
 
+def _normPosixPath(path: bytes) -> bytes:
+    """Collapses empty & `.` segments of the absolute POSIX `path` and
+    drops its trailing slash, like `PurePosixPath`, which also keeps
+    exactly two leading slashes.
+    """
+    segs = [seg for seg in path.split(b'/') if seg and seg != b'.']
+    root = b'//' if path[:2] == b'//' and path[2:3] != b'/' else b'/'
+    return root + b'/'.join(segs)
+
+
+@lru_cache(maxsize=16)
+def _compileAliasRegex(aliases: frozenset[bytes]) -> Pattern[bytes]:
+    """Compiles `_IMPORT_FROM_ALIAS_PATT` for the provided `aliases`. The
+    result is cached, so the same set of aliases is compiled once.
+    """
+    # Sorting aliases, longest first, for a deterministic alternation...
+    sortedAliases = sorted(aliases, key=lambda alias: (-len(alias), alias))
+    pattern = _IMPORT_FROM_ALIAS_PATT.encode().replace(
+        b'{aliases}',
+        b'|'.join(map(re.escape, sortedAliases)))
+    return re.compile(pattern, re.DOTALL | re.VERBOSE)
+
+
+def _scanFiles(
+        dir_: str,
+        exts: frozenset[str],
+        include_subdirs: bool = True,
+        ) -> Iterator[os.DirEntry[str]]:
+    """Yields the directory entries of all regular files with any
+    extension provided in `exts` in `dir_` folder and, if
+    `include_subdirs` is provided, all its subfolders. Symbolic links &
+    folders with no read permission are skipped.
+    """
+    try:
+        entries = os.scandir(dir_)
+    except PermissionError:
+        # Skipping unreadable folders like `Path.rglob`...
+        return
+    with entries:
+        for entry in entries:
+            # Checking the name first, so most entries cost no syscall.
+            # Like `Path.suffix`, names such as `.js` have no extension...
+            head, _, ext = entry.name.rpartition('.')
+            if head and ext.lower() in exts and \
+                    entry.is_file(follow_symlinks=False):
+                yield entry
+            elif include_subdirs and entry.is_dir(follow_symlinks=False):
+                yield from _scanFiles(entry.path, exts, include_subdirs)
+
+
 def _searchFiles(
         dir: str,
-        exts: Iterable[str],
+        exts: frozenset[str],
         mp_alias_path: Mapping[str, str],
         include_subdirs: bool =True,
         ) -> None:
     """Searches in `dir` folder and all its subfolders if
     `include_subdirs` is provided for all files with any extension
-    provided in `exts` to replace their import aliases with the paths
-    in `replacements`.
+    provided in `exts`, lowercase & without the leading dot, to replace
+    their import aliases with the paths in `replacements`.
     """
     # Declaring variables...
-    global _IMPORT_FROM_ALIAS_PATT
-    aliases = '|'.join(map(re.escape, mp_alias_path.keys()))
-    pattern = _IMPORT_FROM_ALIAS_PATT.format(aliases=aliases)
-    regex = re.compile(pattern, re.DOTALL | re.VERBOSE)
+    mpAliasPath = {
+        alias.encode(): path.encode()
+        for alias, path in mp_alias_path.items()}
+    regex = _compileAliasRegex(frozenset(mpAliasPath.keys()))
     # Searching the directory...
-    pthDir = Path(dir)
-    dirsIter = pthDir.rglob('*') if include_subdirs else pthDir.glob('*')
-    for pthFile in dirsIter:
-        if pthFile.is_file() and pthFile.suffix.lstrip('.') in exts:
-            _replaceAliases(pthFile, regex, mp_alias_path)
+    for entry in _scanFiles(dir, exts, include_subdirs):
+        _replaceAliases(entry.path, regex, mpAliasPath)
+
+
+_O_BINARY: int = getattr(os, 'O_BINARY', 0)
+"""The flag to open files in binary mode on Windows, zero elsewhere."""
+
+
+def _writeFile(file: str, data: bytes, mode: int) -> None:
+    """Writes `data` to a temporary file next to `file` and then replaces
+    `file` with it, so `file` is never left half-written. The permission
+    bits of the new file are set from `mode`.
+    """
+    dir_, name = os.path.split(file)
+    fd, tmpFile = tempfile.mkstemp(prefix=f'.{name}.', dir=dir_ or None)
+    try:
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.chmod(tmpFile, stat.S_IMODE(mode))
+        os.replace(tmpFile, file)
+    except BaseException:
+        try:
+            os.remove(tmpFile)
+        except OSError:
+            pass
+        raise
+
+
+def _getSearchStart(
+        content: bytes | mmap.mmap,
+        alias_literals: Iterable[bytes],
+        ) -> int:
+    """Returns the offset of `content` from which import-from statements
+    of the aliases must be searched for, or -1 if none of `alias_literals`
+    occurs in `content`. As import-from clauses contain no quotes, no
+    statement starts before the last quote preceding the first alias.
+    With a single alias, this costs one `bytes.find`.
+    """
+    aliasIdx = min(
+        (idx for idx in map(content.find, alias_literals) if idx >= 0),
+        default=-1)
+    if aliasIdx < 0:
+        return -1
+    # Skipping the opening quote of the alias itself...
+    endIdx = max(aliasIdx - 1, 0)
+    return max(
+        content.rfind(b"'", 0, endIdx),
+        content.rfind(b'"', 0, endIdx)) + 1
+
+
+def _subAliases(
+        content: bytes | mmap.mmap,
+        regex: Pattern[bytes],
+        mp_alias_path: Mapping[bytes, bytes],
+        changes: list[bytes],
+        ) -> bytes | None:
+    """Replaces the aliases of `mp_alias_path` matched by `regex` in
+    `content` and appends them to `changes`. It returns the updated
+    content, or `None` if nothing changed, without copying `content` in
+    that case. The `regex` only runs if an alias occurs in `content`, and
+    only over the part that can contain matches.
+    """
+    startIdx = _getSearchStart(content, mp_alias_path.keys())
+    if startIdx < 0:
+        return None
+    pieces = list[bytes]()
+    prevEnd = 0
+    for match in regex.finditer(content, startIdx):
+        replacement = replaceMatch(changes, mp_alias_path, match)
+        if replacement != match.group(0):
+            pieces.append(content[prevEnd:match.start()])
+            pieces.append(replacement)
+            prevEnd = match.end()
+    if not pieces:
+        return None
+    pieces.append(content[prevEnd:])
+    return b''.join(pieces)
 
 
 def _replaceAliases(
-        file: Path,
-        regex: Pattern[str],
-        mp_alias_path: Mapping[str, str],
+        file: str,
+        regex: Pattern[bytes],
+        mp_alias_path: Mapping[bytes, bytes],
         ) -> None:
     """Searches the `file` against the provided `regex` and replaces any
-    matched alias with the path in `mp_alias_path`.
+    matched alias with the path in `mp_alias_path`. The file is
+    memory-mapped rather than read, so unchanged files are never copied
+    into memory.
     """
     # Declaring stuff...
-    changes = list[str]()
-    replacer = partial(replaceMatch, changes, mp_alias_path)
+    changes = list[bytes]()
+    updatedContent: bytes | None = None
     # Prompting the user...
     msg = STRS.SEARCHING_IMPORT_FROM_ALAIAS.format(file)
     sys.stdout.write(msg)
     sys.stdout.flush()
     # Finding import aliases & replacing them...
-    content = file.read_text()
-    updatedContent = regex.sub(replacer, content)
+    fd = os.open(file, os.O_RDONLY | _O_BINARY)
+    try:
+        fileStat = os.fstat(fd)
+        # Empty files cannot be mapped & have nothing to replace...
+        if fileStat.st_size:
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as content:
+                updatedContent = _subAliases(
+                    content,
+                    regex,
+                    mp_alias_path,
+                    changes)
+    finally:
+        os.close(fd)
     # Clearing previous message...
     sys.stdout.write("\r" + " " * len(msg) + "\r")
     sys.stdout.flush()
     # 
-    if content != updatedContent:
+    if updatedContent is not None:
         print(STRS.REPLACEMENTS_REPORTS.format(file))  
         for alias in changes:
-            print(STRS.REPLACEMENT.format(alias, mp_alias_path[alias]))
-        file.write_text(updatedContent)
+            print(STRS.REPLACEMENT.format(
+                alias.decode(),
+                mp_alias_path[alias].decode()))
+        _writeFile(file, updatedContent, fileStat.st_mode)
 
 
 def main():
@@ -168,9 +325,9 @@ def main():
         help=STRS.ALIAS_HELP,)
     # Getting falgs from the user...
     args = parser.parse_args()
-    # Creating extensions list from args...
-    extensions: list[str] = [
-        ext.strip() for ext in args.exts.split() if ext.strip()]
+    # Creating extensions set from args...
+    extensions = frozenset[str](
+        ext.lstrip('.').lower() for ext in args.exts.split())
     # Creating replacements dictionary from args for easy lookup...
     # Ensuring no slash after aliases...
     # Ensuring paths start with one slash, no trailing slashes...
@@ -179,7 +336,7 @@ def main():
     for alias in aliases:
         pair = alias.split(maxsplit=1)
         key = pair[0].rstrip('/')
-        value = '/' + pair[1].strip('/')
+        value = str(PurePosixPath('/' + pair[1].strip('/')))
         if key in mpAliasPath:
             print(STRS.DUP_ALIASES.format(key))
             return
@@ -189,7 +346,7 @@ def main():
         else STRS.DIR_PRMPT_SUB_DIRS.format(args.dir)
     print(msg)
     # Prompting `extensions`...
-    msg = STRS.EXTS_PRMPT.format(', '.join(extensions))
+    msg = STRS.EXTS_PRMPT.format(', '.join(sorted(extensions)))
     print(msg)
     # Prompting `replacements`...
     print(STRS.REQ_REPLACEMENTS)
@@ -2,15 +2,20 @@
 #
 #
 
-from abc import ABC, abstractmethod
-from datetime import datetime
+import argparse
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 import enum
+from functools import lru_cache
+import heapq
+import os
 from pathlib import Path
+import queue
 import re
 import signal
 import sys
+import threading
 from types import FrameType
-from typing import Generator, Iterable, overload
 
 
 class _STRS:
@@ -24,6 +29,14 @@ class _STRS:
     RENAMED = '\t↷ {old_stem} ⇒ {new_stem}'
     NAME_OK = '\t✔ {stem}'
     BAD_NPR_NAME = '\t🞩 {stem}: {reason}'
+    INODE_ORDER_HELP = (
+        'Visit folders in the order of their inode numbers, which reduces'
+        ' seeks on hard disks (ignored on Windows)')
+    NO_SKIP_HIDDEN_HELP = (
+        'Also look into hidden folders, whose names start with a dot')
+    JOBS_HELP = (
+        'The number of threads to visit folders with. With more than one,'
+        ' folders are reported in no specific order (default: 1)')
 
 
 class _NprNameErrs(enum.IntFlag):
@@ -35,188 +48,322 @@ class _NprNameErrs(enum.IntFlag):
     """8-digit date is not valid"""
     BAD_SLUG = 0x04
     """The podcast name is not a well-formed slug."""
+    OBSCURE_POD_NAME = 0x08
+    """No podcast name before the date."""
 
 
-class ISlugSplitter(ABC):
-    @abstractmethod
-    def split(self, text: str) -> list[str]:
-        pass
-
-
-class HyphDashSplitter(ISlugSplitter):
-    def split(self, text: str) -> list[str]:
-        return re.split(r"[_-]+", text)
-
-
-class AgressiveSplitter(ISlugSplitter):
-    def split(self, text: str) -> list[str]:
-        return re.split(r"(?:_|\W)+", text)
-
-
-class _NprNameParts:
-    def __init__(self, name: str) -> None:
-        self._parts = list[str]()
-        self._dateIdx: int | None = None
-        self._errors: _NprNameErrs = _NprNameErrs.OK
-        self._parse(name)
-    
-    @property
-    def dateIdx(self) -> int | None:
-        """Gets the index of date field."""
-        return self._dateIdx
-    
-    @property
-    def errors(self) -> _NprNameErrs:
-        """Gets errors found during parsing the name."""
-        return self._errors
-    
-    def __iter__(self) -> Iterable[str]:
-        return iter(self._parts)
-    
-    def __eq__(self, obj: object) -> bool:
-        if not isinstance(obj, self.__class__):
-            return NotImplemented
-        return self._parts == obj._parts
-    
-    def __len__(self) -> int:
-        return len(self._parts)
-    
-    @overload
-    def __getitem__(self, index: int) -> str: ...
-    
-    @overload
-    def __getitem__(self, index: slice) -> list[str]: ...
-    
-    def __getitem__(self, index: int | slice) -> str | list[str]:
-        return self._parts[index]
-    
-    def _parse(self, name: str) -> None:
-        """Parses the slugified name into its parts and returns the parts if
-        the name is valid otherwise returns `None`. If the parse process is
-        successful, it also finds the position of the date field in the parts
-        of the name.
-        """
-        badSlugMatch = _badSlugPatt.search(name)
-        if badSlugMatch is None:
-            self._parts = HyphDashSplitter().split(name)
-        else:
-            self._parts = AgressiveSplitter().split(name)
-            self._errors |= _NprNameErrs.BAD_SLUG
-        # Finding date...
-        for i, part in enumerate(self._parts):
-            if len(part) == 8:
-                self._dateIdx = i
-                break
-        # Setting date-related flags...
-        if self._dateIdx is None:
-            self._errors |= _NprNameErrs.NO_DATE
-        elif not self._is8Date(self._parts[self._dateIdx]):
-            self._errors |= _NprNameErrs.INVALID_DATE
+_quitReq = threading.Event()
+"""Specifies whether user requested to terminate the process immaturely."""
+_stdoutLock = threading.Lock()
+"""Serializes writes of reports to the standard output among threads."""
+
+_SKIP_DIRS: frozenset[str] = frozenset({
+    '.git',
+    '.svn',
+    '.hg',
+    '__pycache__',
+    '.Trashes',
+    'System Volume Information',})
+"""Names of folders of version controls, caches & trashes, which are never
+looked into.
+"""
 
+_AUDIO_EXTS: frozenset[str] = frozenset({'.mp3', '.m4a'})
+"""Extensions of audio files, in lowercase."""
 
-    def _is8Date(self, date: str) -> bool:
-        """Checks if the date string is in the format of YYYYMMDD."""
-        try:
-            datetime.strptime(date, "%Y%m%d")
-        except ValueError:
-            return False
-        return True
+_REPORT_BATCH = 256
+"""The maximum number of report lines to hold before writing them out, so
+that huge folders still show progress.
+"""
 
 
-_quitReq = False
-"""Specifies whether user requested to terminate the process immaturely."""
+_slugSepPatt = re.compile(r'(?:_|\W)+')
+"""The pattern of separators of name fields, that is runs of any
+non-alphanumeric character. For well-formed slugified names, these are
+only hyphens and underscores.
+"""
+_dateFieldPatt = re.compile(r'(?<![^\W_])[^\W_]{8}(?![^\W_])')
+"""The pattern to find the first 8-character field of a name, the
+candidate for its date field.
+"""
 
-_AUDIO_EXTS: Iterable[str] = ['.mp3', '.m4a',]
 
+_DAYS_IN_MONTH = (0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+"""The maximum number of days of each month, indexed from 1."""
 
-_BAD_SLUG_REGEX = r'[^-\w]'
-"""The regex which recognizes bad characters in a slugified name, that is
-any character other than hyphen, underscore, or alphanumeric characters.
-"""
-_badSlugPatt = re.compile(_BAD_SLUG_REGEX)
-"""The pattern to find texts that are NOT well-formed slugified names."""
+
+@lru_cache(maxsize=4096)
+def _is8Date(date: str) -> bool:
+    """Checks if the date string is in the format of YYYYMMDD."""
+    if len(date) != 8 or not (date.isascii() and date.isdigit()):
+        return False
+    year = int(date[:4])
+    month = int(date[4:6])
+    day = int(date[6:])
+    if year < 1 or not 1 <= month <= 12:
+        return False
+    # Checking February of common years...
+    if month == 2 and not (
+            year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)):
+        return 1 <= day <= 28
+    return 1 <= day <= _DAYS_IN_MONTH[month]
 
 
+# Many stems recur across folders & re-downloads of the same shows...
+@lru_cache(maxsize=4096)
 def _normalizeNprFileName(name: str) -> str | _NprNameErrs:
-    parts = _NprNameParts(name)
-    if parts is None:
-        return _NprNameErrs.UNSLUGIFIED_POD_NAME
+    """Normalizes the name of an NPR podcast file to
+    `<podcast>___<YYYYMMDD>_<description>`, in which fields are joined by
+    underscores, or returns the error of the name.
+    """
     # Checking date field existence...
-    if parts.dateIdx is None:
+    dateMatch = _dateFieldPatt.search(name)
+    if dateMatch is None:
         return _NprNameErrs.NO_DATE
     # Checking date validity...
-    if not _is8Date(parts[parts.dateIdx]):
+    date = dateMatch.group()
+    if not _is8Date(date):
         return _NprNameErrs.INVALID_DATE
     # Reconstructing name...
-    if parts.dateIdx == 0:
+    startIdx, endIdx = dateMatch.span()
+    if startIdx == 0:
         return _NprNameErrs.OBSCURE_POD_NAME
-    podName = '_'.join(parts[:parts.dateIdx])
-    description = '_'.join(parts[parts.dateIdx + 1:])
-    return f'{podName}___{parts[parts.dateIdx]}_{description}'
-
-
-def _checkPodFiles(dir_: Path) -> Generator[None, Path | None, None]:
-    print(_STRS.NPR_POD_DIR.format(dir_=dir_))
-    file: Path | None = yield
-    while file is not None:
-        stem = file.stem
-        newStem = _normalizeNprFileName(stem)
-        if isinstance(newStem, _NprNameErrs):
-            print(_STRS.BAD_NPR_NAME.format(stem=stem, reason=newStem.name))
-        elif stem == newStem:
-            print(_STRS.NAME_OK.format(stem=stem))
-        else:
-            # Renaing the file...
-            #file.rename(file.with_stem(newStem))
-            print(_STRS.RENAMED.format(old_stem=stem, new_stem=newStem))
-        #
-        file = yield
+    # The separators just before & after the date become `___` & `_`...
+    podName = _slugSepPatt.sub('_', name[:startIdx])[:-1]
+    description = _slugSepPatt.sub('_', name[endIdx:])[1:]
+    return f'{podName}___{date}_{description}'
 
 
-def _iterDir(dir_: Path) -> None:
+def _checkPodFile(dir_: str, name: str) -> str:
+    """Checks the name of the provided podcast file in the folder and
+    returns the report line of it. The name must have an extension.
+    """
+    stem = name[:name.rfind('.')]
+    newStem = _normalizeNprFileName(stem)
+    if isinstance(newStem, _NprNameErrs):
+        return _STRS.BAD_NPR_NAME.format(stem=stem, reason=newStem.name)
+    elif stem == newStem:
+        return _STRS.NAME_OK.format(stem=stem)
+    else:
+        # Renaing the file...
+        #os.rename(
+        #    os.path.join(dir_, name),
+        #    os.path.join(dir_, newStem + name[len(stem):]))
+        return _STRS.RENAMED.format(old_stem=stem, new_stem=newStem)
+
+
+def _visitDir(
+        dir_: str,
+        inode_order: bool,
+        skip_hidden: bool,
+        repeat_header: bool,
+        quit_req: Callable[[], bool],
+        ) -> list[tuple[int, str]]:
+    """Checks the audio files of the provided folder, reports them, and
+    returns `(inode, path)` of its sub-folders in their listing order.
+    Inodes are only retrieved if `inode_order` is provided, otherwise they
+    are zero. Sub-folders in `_SKIP_DIRS`, and hidden ones if `skip_hidden`
+    is provided, are left out. If `repeat_header` is provided, every
+    batch of the report starts with the folder header, as batches of
+    other threads might come in between. It stops checking files as soon
+    as `quit_req` returns true.
+    """
+    # Declaring stuff ---------------------------
+    subdirs = list[tuple[int, str]]()
+    audioNames = list[str]()
+    entry: os.DirEntry[str]
+    # Binding methods & globals of the loops to locals...
+    appendSubdir = subdirs.append
+    appendAudioName = audioNames.append
+    isAudioExt = _AUDIO_EXTS.__contains__
+    isSkipDir = _SKIP_DIRS.__contains__
+    # Classifying all entries of the folder in one batch...
+    with os.scandir(dir_) as entries:
+        for entry in entries:
+            name = entry.name
+            # Not following links, so types come from the scan itself...
+            if entry.is_dir(follow_symlinks=False):
+                # Pruning sub-folders which include no podcasts...
+                if isSkipDir(name) or (skip_hidden and name[:1] == '.'):
+                    continue
+                # `DirEntry.inode` is free except on Windows...
+                appendSubdir(
+                    (entry.inode() if inode_order else 0, entry.path))
+            elif entry.is_file(follow_symlinks=False):
+                # Like `Path.suffix`, names such as `.mp3` have no
+                # extension...
+                dotIdx = name.rfind('.')
+                if dotIdx > 0 and isAudioExt(name[dotIdx:].lower()):
+                    appendAudioName(name)
+            elif entry.is_symlink():
+                # Skipping links...
+                continue
+            else:
+                sys.stderr.write(
+                    _STRS.UNKNOWN_FS_ITEM.format(item=entry.path) + '\n')
+    # Checking audio files once the folder is closed & reporting them
+    # in batches of writes, rather than a print per file. Folders
+    # without audio files get no header...
+    if audioNames:
+        report = [_STRS.NPR_POD_DIR.format(dir_=dir_)]
+        # The number of header lines kept in the report after a batch...
+        keptLen = 1 if repeat_header else 0
+        appendReport = report.append
+        checkPodFile = _checkPodFile
+        for name in audioNames:
+            if quit_req():
+                break
+            appendReport(checkPodFile(dir_, name))
+            if len(report) >= _REPORT_BATCH:
+                _writeReport(report)
+                del report[keptLen:]
+        if len(report) > keptLen:
+            _writeReport(report)
+    return subdirs
+
+
+def _writeReport(report: list[str]) -> None:
+    """Writes the provided report lines to the standard output at once."""
+    with _stdoutLock:
+        sys.stdout.write('\n'.join(report) + '\n')
+        sys.stdout.flush()
+
+
+def _iterDir(
+        dir_: Path,
+        inode_order: bool = False,
+        jobs: int = 1,
+        skip_hidden: bool = True,
+        ) -> None:
     """Iterates over the provided folder and all its sub-folders for audio
     files. It riases `NotADirectoryError` if the provided path is not a
-    valid directory. By setting the global `_quitReq` to `True`, it stops
+    valid directory. By setting the global `_quitReq` event, it stops
     and returns as soon as possible.
+
+    Folders are visited depth-first unless `inode_order` is provided, in
+    which case the pending folder with the lowest inode number is visited
+    next. On hard disks, neighboring inodes tend to be stored close to
+    each other, so this reduces seeks. It is ignored on Windows, where
+    inode numbers are not cheap to get and say nothing about placement.
+
+    If `jobs` is more than one, that many threads visit folders at the
+    same time, so folders are reported in no specific order.
+
+    Folders in `_SKIP_DIRS`, and hidden ones unless `skip_hidden` is
+    false, are not looked into.
     """
     # Declaring stuff ---------------------------
-    global _quitReq
-    subdirs = list[Path]()
-    item: Path
-    # Iterating over the current folder ---------
+    quitReq = _quitReq.is_set
+    inode_order = inode_order and os.name != 'nt'
+    # A stack, or a heap in inode order, of `(inode, path)` of folders...
+    pendingDirs: list[tuple[int, str]] = [(0, str(dir_))]
+    # Iterating over the folder & sub-folders ---
     if not dir_.is_dir():
         raise NotADirectoryError(
             f"The provided path {dir_} is not a directory.")
-    podFilesChecker = _checkPodFiles(dir_)
-    next(podFilesChecker)
-    for item in dir_.iterdir():
-        if _quitReq:
-            return
-        try:
-            item.resolve(strict=True)
-        except OSError:
-            continue
-        if item.is_dir():
-            subdirs.append(item)
-        elif item.is_file():
-            if item.suffix.lower() in _AUDIO_EXTS:
-                podFilesChecker.send(item)
+    if jobs > 1:
+        _iterDirThreaded(pendingDirs[0], inode_order, jobs, skip_hidden)
+        return
+    while pendingDirs and not quitReq():
+        if inode_order:
+            _, currDir = heapq.heappop(pendingDirs)
         else:
-            sys.stderr.write(_STRS.UNKNOWN_FS_ITEM.format(item=item) + '\n')
-    # Finishing process of files in the current folder...
-    try:
-        podFilesChecker.send(None)
-    except StopIteration:
-        pass
-    del podFilesChecker
-    # Iterating over sub-folders ----------------
-    for item in subdirs:
-        if _quitReq:
-            return
-        _iterDir(item)
+            _, currDir = pendingDirs.pop()
+        subdirs = _visitDir(
+            currDir,
+            inode_order,
+            skip_hidden,
+            False,
+            quitReq)
+        if inode_order:
+            for subdir in subdirs:
+                heapq.heappush(pendingDirs, subdir)
+        else:
+            # Visiting sub-folders depth-first in their listing order...
+            pendingDirs.extend(reversed(subdirs))
+
+
+def _iterDirThreaded(
+        root: tuple[int, str],
+        inode_order: bool,
+        jobs: int,
+        skip_hidden: bool,
+        ) -> None:
+    """Visits the provided `(inode, path)` folder and all its sub-folders
+    by `jobs` threads sharing a queue of pending folders. Listing &
+    stat calls release the GIL, so their latencies overlap. The first
+    error of the threads is raised after they all stopped.
+    """
+    # Declaring stuff ---------------------------
+    errs = list[Exception]()
+    stopReq = threading.Event()
+    pendingDirs: queue.Queue[tuple[int, str]]
+    if inode_order:
+        pendingDirs = queue.PriorityQueue()
+    else:
+        pendingDirs = queue.LifoQueue()
+    isQuitReq = _quitReq.is_set
+    isStopReq = stopReq.is_set
+    def quitReq() -> bool:
+        return isQuitReq() or isStopReq()
+    def work() -> None:
+        while True:
+            _, currDir = pendingDirs.get()
+            try:
+                # An empty path tells the thread to finish...
+                if not currDir:
+                    return
+                # Draining the queue after a quit request...
+                if quitReq():
+                    continue
+                subdirs = _visitDir(
+                    currDir,
+                    inode_order,
+                    skip_hidden,
+                    True,
+                    quitReq)
+                for subdir in (subdirs if inode_order else reversed(subdirs)):
+                    pendingDirs.put(subdir)
+            except Exception as err:
+                errs.append(err)
+                stopReq.set()
+            finally:
+                pendingDirs.task_done()
+    # Visiting folders --------------------------
+    pendingDirs.put(root)
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        for _ in range(jobs):
+            executor.submit(work)
+        # Waiting for all folders to be visited, then finishing threads...
+        pendingDirs.join()
+        for _ in range(jobs):
+            pendingDirs.put((0, ''))
+    if errs:
+        raise errs[0]
 
 
 def main() -> None:
+    # Defining flags...
+    parser = argparse.ArgumentParser(
+        prog=_STRS.APP_NAME,
+        description=_STRS.APP_DESCR)
+    parser.add_argument(
+        '--inode-order',
+        action='store_true',
+        default=False,
+        help=_STRS.INODE_ORDER_HELP,)
+    parser.add_argument(
+        '-j',
+        '--jobs',
+        type=int,
+        default=1,
+        help=_STRS.JOBS_HELP,)
+    parser.add_argument(
+        '--no-skip-hidden',
+        action='store_false',
+        dest='skip_hidden',
+        help=_STRS.NO_SKIP_HIDDEN_HELP,)
+    args = parser.parse_args()
     # Printing the app info...
     print('=' * 60)
     print('\t', _STRS.APP_NAME)
@@ -231,15 +378,18 @@ def main() -> None:
             break
         # Iterating the folder...
         try:
-            _iterDir(Path(dir_))
+            _iterDir(
+                Path(dir_),
+                args.inode_order,
+                args.jobs,
+                args.skip_hidden)
             break
         except NotADirectoryError as err:
             print(_STRS.BAD_DIR.format(reason=str(err)))
 
 
 def _requestQuit(sig: int, frame: FrameType | None) -> None:
-    global _quitReq
-    _quitReq = True
+    _quitReq.set()
 
 
 if __name__ == '__main__':